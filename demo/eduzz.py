@@ -22,20 +22,29 @@ For simplicity I chose to not build an extended exception hierarchy.
 The magic happens in the `from_credentials` factory that will instantiate and compose all the pieces.
 
 The Client and SubClients are simple because we handled all the API crazyness before, so they are just thin
-wrappers around the API.
+wrappers around the API. Even caching stays out of their bodies: reads that can be a few seconds stale are
+marked with `ttl_cache` and the writes that would make them stale with `clears_ttl_cache`.
 """
 
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from datetime import datetime
+from functools import wraps
 from typing import Any, TypeVar
+from zoneinfo import ZoneInfo
 
-import pytz
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 from requestspro.auth import RecoverableAuth
 from requestspro.client import Client, MainClient
 from requestspro.sessions import ProResponse, ProSession
 from requestspro.token import TokenStore
-from requestspro.utc import utc_now
+from requestspro.utc import UTC, utc_now
 
 
 # Type variables for more descriptive API types
@@ -45,7 +54,70 @@ Data = TypeVar("Data", bound=dict[str, Any])
 TokenData = TypeVar("TokenData", bound=str)
 TokenExpiry = TypeVar("TokenExpiry", bound=int)
 
-SAO_PAULO = pytz.timezone("America/Sao_Paulo")
+SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+
+
+def ttl_cache(seconds, maxsize=128):
+    """Memoize a subclient read for a few seconds, keyed on its params.
+
+    Results live on the subclient instance, so they go away with it. Expired entries are evicted on insert
+    and at most `maxsize` are kept. Calls with unhashable params (e.g. lists) are never cached.
+    Every caller gets its own copy of the result, so mutating it never changes what later callers see.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            freeze = lambda v: frozenset(v.items()) if isinstance(v, dict) else v
+            try:
+                key = (method.__name__, *map(freeze, args), *((k, freeze(v)) for k, v in sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+
+            cache = vars(self).setdefault("_ttl_cache", {})
+            now = time.monotonic()
+            if (hit := cache.get(key)) and hit[0] > now:
+                return deepcopy(hit[1])
+
+            result = method(self, *args, **kwargs)
+
+            for k, (expires_at, _) in list(cache.items()):
+                if expires_at <= now:
+                    cache.pop(k, None)
+            while len(cache) >= maxsize:
+                cache.pop(next(iter(cache)), None)
+
+            cache[key] = (now + seconds, result)
+            return deepcopy(result)
+
+        return wrapper
+
+    return decorator
+
+
+def ttl_cache_clear(subclient):
+    """Drop every read memoized by `ttl_cache` on the subclient."""
+    vars(subclient).pop("_ttl_cache", None)
+
+
+def clears_ttl_cache(method):
+    """Mark a subclient write so its memoized reads never outlive it."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            ttl_cache_clear(self)
+
+    return wrapper
+
+
+def _renew_in_background(auth_ref):
+    """Timer target holding the auth weakly, so an auth dropped without close() is collected and stops renewing."""
+    if auth := auth_ref():
+        auth._background_renew()
 
 
 class EduzzAPIError(RequestException):
@@ -58,25 +130,36 @@ class EduzzAPIError(RequestException):
 class EduzzResponse(ProResponse):
     """Handles all the API error particularities."""
 
-    ERROR_STATUSES = {400, 401, 403, 404, 405, 409, 422, 500}
+    ERROR_STATUSES = frozenset({400, 401, 403, 404, 405, 409, 422, 500})
 
     def raise_for_status(self):
         """Handle API logic errors and delegate HTTP errors to the superclass."""
-        if self.status_code in self.ERROR_STATUSES:
-            json = self.json()
-            code, details = json["code"], json["details"]
-
-            msg = f"{code} {details}"
+        if self.status_code in self.ERROR_STATUSES and (msg := self._api_error_message()):
             raise EduzzAPIError(msg, response=self)
 
         super().raise_for_status()
 
+    def _api_error_message(self):
+        """Return the API error message, or None when the body is not an API error (e.g. a proxy HTML page)."""
+        try:
+            json = self.json()
+            code, details = json["code"], json["details"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        return f"{code} {details}"
+
 
 class EduzzSession(ProSession):
     """Custom session for Eduzz API with proper response handling and JSON encoding."""
 
     RESPONSE_CLASS = EduzzResponse
     BASE_URL = "https://api2.eduzz.com"
+    POOL_SIZE = 50  # Keep-alive connections kept per host; size it to your concurrency.
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.mount("https://", HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE))
 
 
 class EduzzAuth(RecoverableAuth):
@@ -84,19 +167,81 @@ class EduzzAuth(RecoverableAuth):
 
     AUTH_PATH = "/credential/generate_token"
     SESSION_CLASS = EduzzSession
+    REFRESH_RATIO = 0.5  # Renew in background after this fraction of the token lifetime.
+    REPLACED_TOKEN_TTL = 30  # Seconds during which a 401 for a replaced token is retried without invalidation.
 
-    def __init__(self, token, email, publickey, apikey):
+    def __init__(self, token, email, publickey, apikey, clock=time.monotonic):
         self.credentials = {"email": email, "publickey": publickey, "apikey": apikey}
+        self._clock = clock
+        self._token_cache = None
+        self._token_expires_at = 0.0
+        self._renew_lock = threading.Lock()
+        self._renewals = 0
+        self._replaced_tokens = {}
+        self._auth_session = None
+        self._refresh_timer = None
+        self._refresh_finalizer = None
+        self._closed = False
         super().__init__(token)
 
     def authorize(self, req):
-        req.headers["Token"] = self.token
+        # Steady-state requests reuse the cached token without querying the TokenStore until it expires.
+        # A token read from the store has an unknown expiry, so it is checked against the store every time.
+        if self._token_cache is None or self._clock() >= self._token_expires_at:
+            self._token_cache = self.token
+
+        req.headers["Token"] = self._token_cache
         return req
 
+    def handle_401(self, response, **kwargs):
+        """Forget the cached token so the recovery request reads it again from the TokenStore.
+
+        Requests signed with a token that was just replaced are retried with the current one instead,
+        since their 401 says nothing about the token now in use.
+        """
+        sent_token = response.request.headers.get("Token")
+        if response.status_code == 401 and not self._was_replaced(sent_token):
+            # Other requests already signed with the rejected token must not clear the refilled cache.
+            self._remember_replaced(sent_token)
+            self._token_cache = None
+
+        return super().handle_401(response, **kwargs)
+
     def renew(self, now=utc_now) -> tuple[TokenData, TokenExpiry]:
-        """Renew the authentication token."""
-        r = self.session_class().post(self.AUTH_PATH, params=self.credentials)
+        """Renew the authentication token once, even when many threads find it expired at the same time."""
+        renewals = self._renewals
+        with self._renew_lock:
+            # Threads that waited on the lock while another one renewed reuse its token.
+            if self._renewals != renewals and self._token_cache:
+                return self._token_cache, self._token_expires_at - self._clock()
+
+            token, ttl = self._generate_token(now)
+
+            if self._token_cache != token:
+                self._remember_replaced(self._token_cache)
+            self._token_cache = token
+            self._token_expires_at = self._clock() + ttl
+            self._renewals += 1
+            self._schedule_refresh(ttl)
+            return token, ttl
+
+    def _generate_token(self, now) -> tuple[TokenData, TokenExpiry]:
+        """Requires the lock."""
+        # A closed auth keeps no connection around, so a late renewal gets a throwaway session.
+        if self._closed:
+            with self.session_class() as session:
+                return self._request_token(session, now)
+
+        # A long-lived session without auth lets renewals reuse the same keep-alive connection.
+        if self._auth_session is None:
+            self._auth_session = self.session_class()
+
+        return self._request_token(self._auth_session, now)
+
+    def _request_token(self, session, now) -> tuple[TokenData, TokenExpiry]:
+        r = session.post(self.AUTH_PATH, params=self.credentials)
         r.raise_for_status()
+        received_at = now()  # The TTL counts from when the token was issued, not from after parsing it.
 
         json = r.json()
         token = json["data"]["token"]
@@ -104,13 +249,56 @@ class EduzzAuth(RecoverableAuth):
 
         # Token expiration date is provided without the explicit TZ, so we need to
         # convert it to the correct timezone and then to UTC.
-        dt = datetime.fromisoformat(token_valid_until)
-        dt.replace(tzinfo=SAO_PAULO)
-        dt = dt.astimezone(pytz.UTC)
-        ttl = (dt - now()).total_seconds()
+        dt = datetime.fromisoformat(token_valid_until).replace(tzinfo=SAO_PAULO).astimezone(UTC)
+        ttl = (dt - received_at).total_seconds()
 
         return token, ttl
 
+    def _remember_replaced(self, token):
+        now = self._clock()
+        self._replaced_tokens = {t: until for t, until in self._replaced_tokens.items() if until > now}
+        if token:
+            self._replaced_tokens[token] = now + self.REPLACED_TOKEN_TTL
+
+    def _was_replaced(self, token):
+        return self._replaced_tokens.get(token, 0) > self._clock()
+
+    def close(self):
+        """Stop the background renewal for good and release the renewal connection."""
+        # Holding the lock waits for a running renewal, so it cannot schedule a timer after we return.
+        with self._renew_lock:
+            self._closed = True
+            self._cancel_refresh()
+            if self._auth_session:
+                self._auth_session.close()
+                self._auth_session = None
+
+    def _cancel_refresh(self):
+        if self._refresh_timer:
+            self._refresh_finalizer.detach()
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    def _schedule_refresh(self, ttl):
+        """Renew the token before it expires so foreground requests never wait for it. Requires the lock."""
+        self._cancel_refresh()
+        if self._closed or ttl <= 0:
+            return
+
+        self._refresh_timer = threading.Timer(ttl * self.REFRESH_RATIO, _renew_in_background, args=(weakref.ref(self),))
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+        # If the auth is collected before the timer fires, release its thread right away.
+        self._refresh_finalizer = weakref.finalize(self, self._refresh_timer.cancel)
+
+    def _background_renew(self):
+        try:
+            self._token(*self.renew())
+        except (RequestException, LookupError, TypeError, ValueError):
+            # Keep the current token and try again halfway through what is left of its lifetime.
+            with self._renew_lock:
+                self._schedule_refresh(self._token_expires_at - self._clock())
+
 
 class EduzzClient(MainClient):
     """Main client for Eduzz V2 API."""
@@ -128,19 +316,35 @@ class EduzzClient(MainClient):
         self.user = EduzzUserSubClient(session)
         self.sales = EduzzSalesSubClient(session)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop the background token renewal and release the session connections."""
+        if isinstance(self.session.auth, EduzzAuth):
+            self.session.auth.close()
+        self.session.close()
+
 
 class EduzzUserSubClient(Client):
     """SubClient for managing your profile in Eduzz."""
 
+    @ttl_cache(seconds=5)
     def get_me(self) -> JSON:
         return self.get("/user/get_me")
 
+    @clears_ttl_cache
     def set_me(self, data: Data) -> JSON:
         return self.post("/user/set_me", json=data)
 
+    @clears_ttl_cache
     def set_me_as_producer(self) -> JSON:
         return self.post("/user/set_me_as_producer")
 
+    @clears_ttl_cache
     def change_password(self, data: Data) -> JSON:
         return self.post("/user/change_password", json=data)
 
@@ -157,6 +361,16 @@ class EduzzSalesSubClient(Client):
     def retrieve(self, sale_id: int) -> JSON:
         return self.get(f"/sale/get_sale/{sale_id}")
 
+    def retrieve_many(self, sale_ids: Iterable[int], max_workers: int = 10) -> Sequence[JSON]:
+        """Retrieve sales concurrently, in the given order.
+
+        Keep `max_workers` up to `EduzzSession.POOL_SIZE` so every worker reuses a pooled connection.
+        When a lookup fails, lookups not started yet are cancelled and its error is raised once those in flight end.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.retrieve, sale_ids))
+
+    @ttl_cache(seconds=5)
     def last_days_amount(self, params: Params = None) -> JSON:
         return self.get("/sale/last_days_amount", params=params)
 
@@ -187,3 +401,5 @@ if __name__ == "__main__":
 
     # Do stuff
     print(client.user.get_me())  # noqa: T201
+
+    client.close()
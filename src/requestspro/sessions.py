@@ -77,7 +77,19 @@ class ProResponse(Response):
         return f"<Response [{self.status_code}] {self.url}>"
 
     def json(self, **kwargs):
-        """Decodes data with custom json decoder and caches the resulting dictionary."""
+        """Decodes data with custom json decoder and caches the resulting dictionary.
+
+        Only calls without kwargs are cached, since kwargs can change the decoded result.
+        """
+        if kwargs:
+            return self._decode_json(**kwargs)
+
+        # Checking __dict__ because responses cast by CustomResponseSession skip __init__.
+        if "_json" not in self.__dict__:
+            self._json = self._decode_json()
+        return self._json
+
+    def _decode_json(self, **kwargs):
         params = {**self.json_decoder_options, "cls": self.json_decoder, **kwargs}
         return super().json(**params)
 
@@ -9,7 +9,6 @@ from requestspro.utc import UTC
 
 import pytest
 from freezegun import freeze_time
-from unittest.mock import patch
 
 
 NOW = datetime(2021, 12, 4, 0, 0, 0, tzinfo=UTC)
@@ -27,17 +26,17 @@ class TestRecoverableAuth:
     def auth(self):
         return SampleAuth(TokenStore.in_memory(), Session)
 
-    def test_token_refreshed_on_first_acces(self, auth, responses):
+    def test_token_refreshed_on_first_acces(self, auth):
         assert auth.token == "TOKEN"
 
-    def test_auth_renew_when_token_empty(self, auth, responses):
+    def test_auth_renew_when_token_empty(self, auth):
         request = PreparedRequest()
         request.prepare("GET", "https://h/first", auth=auth)
 
         assert request.headers["Authorization"] == "Bearer TOKEN"
 
     @freeze_time(NOW)
-    def test_auth_renew_when_token_expired(self, auth, responses):
+    def test_auth_renew_when_token_expired(self, auth):
         auth.token = ("EXPIRED", 0)
 
         request = PreparedRequest()
@@ -62,13 +61,13 @@ class TestRecoverableAuth:
         assert r.status_code == 200
 
     @freeze_time(NOW)
-    def test_auth_dont_recover_twice(self, auth, responses):
+    def test_auth_dont_recover_twice(self, auth, responses, monkeypatch):
         # First renew is due to auth without token.
         auth.token = ("EXPIRED1", -1)
         # Then we try a GET and force a 401 as if the token expiration was not detected.
         responses.add("GET", "https://h/first", status=401)
         # The 401 will trigger auth.handle_401 that will renew the token once more
-        patch.object(auth, "renew", return_value=("EXPIRED2", -1))
+        monkeypatch.setattr(auth, "renew", lambda: ("EXPIRED2", -1))
         # The auth.handle_401 will then retry the failed request.
         responses.add("GET", "https://h/first", status=401, json={"Message": "No Token"})
 
@@ -76,3 +75,4 @@ class TestRecoverableAuth:
             requests.get("https://h/first", auth=auth)
 
         assert len(responses.calls) == 2
+        assert responses.calls[1].request.headers["Authorization"] == "Bearer EXPIRED2"
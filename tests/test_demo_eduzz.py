@@ -0,0 +1,501 @@
+import gc
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from requests import HTTPError, Request
+
+from demo.eduzz import (
+    SAO_PAULO,
+    EduzzAPIError,
+    EduzzAuth,
+    EduzzClient,
+    EduzzResponse,
+    EduzzSalesSubClient,
+    EduzzSession,
+    EduzzUserSubClient,
+)
+
+from requestspro.token import TokenStore
+from requestspro.utc import UTC
+
+import pytest
+from freezegun import freeze_time
+
+
+NOW = datetime(2021, 12, 4, 0, 0, 0, tzinfo=UTC)
+AUTH_URL = "https://api2.eduzz.com/credential/generate_token"
+
+
+def token_response(token, ttl=3600):
+    """Mimic the API answer: the expiry comes as a naive Sao Paulo datetime."""
+    valid_until = datetime.now(SAO_PAULO).replace(tzinfo=None) + timedelta(seconds=ttl)
+    return {
+        "method": "POST",
+        "url": AUTH_URL,
+        "json": {"data": {"token": token, "token_valid_until": valid_until.isoformat()}},
+    }
+
+
+@pytest.fixture
+def clock():
+    """A monotonic clock frozen at zero that tests move forward by hand."""
+    clock = lambda: clock.now
+    clock.now = 0.0
+    return clock
+
+
+@pytest.fixture
+def auth(clock):
+    auth = EduzzAuth(TokenStore.in_memory(), "email", "publickey", "apikey", clock=clock)
+    yield auth
+    auth.close()
+
+
+class TestEduzzAuthTokenCache:
+    def test_cache_is_filled_again_after_a_401(self, auth, responses):
+        responses.add(**token_response("T1"))
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=401)
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=200, json={})
+        session = EduzzSession(auth=auth)
+
+        # given: a first request that fills the cache and gets a 401
+        session.get("/user/get_me")
+
+        # when: the recovery request is authorized again
+        # then: the cache holds the token read back from the store
+        assert auth._token_cache == "T1"
+        assert responses.calls[-1].request.headers["Token"] == "T1"
+
+    def test_cached_token_spares_the_store(self, auth, responses, monkeypatch):
+        responses.add(**token_response("T1"))
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=200, json={})
+        session = EduzzSession(auth=auth)
+        session.get("/user/get_me")
+
+        # given: a store that can no longer be read
+        monkeypatch.setattr(auth, "_token", lambda *args: pytest.fail("TokenStore was read"))
+
+        # when: another request is made
+        session.get("/user/get_me")
+
+        # then: it is signed with the cached token
+        assert responses.calls[-1].request.headers["Token"] == "T1"
+
+    def test_expired_cached_token_is_renewed_before_the_request(self, auth, clock, responses):
+        responses.add(**token_response("T1"))
+        responses.add(**token_response("T2"))
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=200, json={})
+        session = EduzzSession(auth=auth)
+        session.get("/user/get_me")
+
+        # given: the cached token and the stored one both expired
+        clock.now = 3600.0
+        auth.token = ("T1", 0)
+
+        # when: another request is made
+        session.get("/user/get_me")
+
+        # then: it goes out with a renewed token instead of paying a 401
+        assert [c.request.headers.get("Token") for c in responses.calls[1::2]] == ["T1", "T2"]
+        assert all(c.response.status_code == 200 for c in responses.calls)
+
+    def test_token_from_the_store_follows_its_expiry(self, auth, responses):
+        responses.add(**token_response("T1"))
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=200, json={})
+        session = EduzzSession(auth=auth)
+
+        # given: a token seeded in a shared store, used by a first request
+        auth.token = ("SEEDED", 3600)
+        session.get("/user/get_me")
+
+        # when: the store expires it
+        auth.token = ("SEEDED", 0)
+        session.get("/user/get_me")
+
+        # then: the next request is signed with a renewed token
+        assert [c.request.headers.get("Token") for c in responses.calls if c.request.method == "GET"] == [
+            "SEEDED",
+            "T1",
+        ]
+
+    def test_expired_token_rejected_twice_is_renewed_once(self, auth, clock, responses, monkeypatch):
+        responses.add(**token_response("NEW"))
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=401)
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=200, json={})
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=401)
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", status=200, json={})
+        session = EduzzSession(auth=auth)
+
+        # given: two requests signed with a token that expires before they are sent
+        auth.token = ("OLD", 3600)
+        first, second = (session.prepare_request(Request("GET", "/user/get_me")) for _ in range(2))
+        auth.token = ("OLD", 0)
+        clock.now = 3600.0
+
+        # when: the first one is rejected and recovers with a renewed token
+        session.send(first)
+        # and: the second one is rejected as well
+        monkeypatch.setattr(auth, "_token", lambda *args: pytest.fail("TokenStore was read"))
+        session.send(second)
+
+        # then: the renewed token survives the second 401 and signs its recovery
+        assert auth._token_cache == "NEW"
+        assert [c.request.headers["Token"] for c in responses.calls if c.request.method == "GET"] == [
+            "OLD",
+            "NEW",
+            "OLD",
+            "NEW",
+        ]
+
+
+class BarrierLock:
+    """A lock that lets threads in only after `parties` of them arrived at it."""
+
+    def __init__(self, parties):
+        self._barrier = threading.Barrier(parties, timeout=5)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._barrier.wait()
+        self._lock.acquire()
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+
+class TestEduzzAuthRenewal:
+    def test_threads_waiting_on_a_renewal_reuse_its_token(self, auth, responses, monkeypatch):
+        responses.add(**token_response("T1"))
+        responses.add(**token_response("T2"))
+
+        # given: many threads that all read the renewal counter before any of them gets the lock
+        monkeypatch.setattr(auth, "_renew_lock", BarrierLock(parties=5))
+
+        # when: they all ask for a renewal at once
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: auth.renew(), range(5)))
+
+        # then: a single token request happened and every thread got its token
+        assert len(responses.calls) == 1
+        assert {token for token, _ in results} == {"T1"}
+        # and, with the clock standing still, the reused tokens report the whole lifetime
+        assert all(ttl == pytest.approx(3600, abs=1) for _, ttl in results)
+
+    def test_a_later_renewal_is_never_skipped(self, auth, responses):
+        responses.add(**token_response("T1"))
+        responses.add(**token_response("T2"))
+
+        # given: a token just renewed
+        auth.renew()
+
+        # when: a new renewal is requested without anyone renewing meanwhile
+        token, _ = auth.renew()
+
+        # then: the token is really renewed
+        assert token == "T2"
+        assert len(responses.calls) == 2
+
+    def test_background_renewal_keeps_rescheduling_short_lived_tokens(self, auth, responses):
+        responses.add(**token_response("T1", ttl=8))
+        responses.add(**token_response("T2", ttl=8))
+
+        # given: a short-lived token scheduled for renewal halfway through its life
+        auth.token  # noqa: B018
+        first_timer = auth._refresh_timer
+        assert first_timer.interval == pytest.approx(4, abs=1)
+
+        # when: the background renewal fires
+        auth._background_renew()
+
+        # then: the token is renewed, stored, and the next renewal is scheduled
+        assert auth._token_cache == "T2"
+        assert auth.stored_token == "T2"
+        assert auth._refresh_timer is not first_timer
+        assert auth._refresh_timer.interval == pytest.approx(4, abs=1)
+
+    def test_failed_background_renewal_keeps_the_token_and_retries(self, auth, clock, responses):
+        responses.add(**token_response("T1"))
+        responses.add("POST", AUTH_URL, status=200, json={"unexpected": "body"})
+
+        # given: a token halfway through its lifetime
+        auth.token  # noqa: B018
+        clock.now = 1800.0
+
+        # when: the background renewal gets a malformed answer
+        auth._background_renew()
+
+        # then: the current token is kept and a new attempt is scheduled halfway through what is left
+        assert auth._token_cache == "T1"
+        assert auth._refresh_timer.interval == pytest.approx(900, abs=1)
+
+    def test_no_renewal_is_scheduled_after_close(self, auth, responses):
+        responses.add(**token_response("T1"))
+        responses.add(**token_response("T2"))
+        auth.token  # noqa: B018
+
+        # given: a closed auth
+        auth.close()
+
+        # when: a background renewal that was already running completes
+        auth._background_renew()
+
+        # then: it schedules nothing else
+        assert auth._token_cache == "T2"
+        assert auth._refresh_timer is None
+
+
+class TestTTLCache:
+    @pytest.fixture
+    def user(self, responses):
+        responses.add("GET", "https://api2.eduzz.com/user/get_me", json={"name": "Henrique"})
+        responses.add("POST", "https://api2.eduzz.com/user/set_me", json={})
+        return EduzzUserSubClient(EduzzSession())
+
+    @pytest.fixture
+    def sales(self, responses):
+        responses.add("GET", "https://api2.eduzz.com/sale/last_days_amount", json={"amount": 1})
+        return EduzzSalesSubClient(EduzzSession())
+
+    def test_repeated_reads_hit_the_network_once(self, user, responses):
+        # given: a read just made
+        user.get_me()
+
+        # when: it is repeated right away
+        result = user.get_me()
+
+        # then: the cached result is served
+        assert result == {"name": "Henrique"}
+        assert len(responses.calls) == 1
+
+    def test_callers_cannot_change_the_cached_result(self, user):
+        # given: a caller that changes the result it got
+        user.get_me()["name"] = "Bastos"
+
+        # when: the read is repeated while cached
+        result = user.get_me()
+
+        # then: the next caller gets the original result
+        assert result == {"name": "Henrique"}
+
+    @freeze_time(NOW)
+    def test_reads_expire(self, user, responses):
+        user.get_me()
+
+        # when: the read is repeated after the cache expired
+        with freeze_time(NOW + timedelta(seconds=6)):
+            user.get_me()
+
+        # then: it goes to the network again
+        assert len(responses.calls) == 2
+
+    def test_writes_drop_the_cached_reads(self, user, responses):
+        # given: a cached profile
+        user.get_me()
+
+        # when: the profile is changed
+        user.set_me({"name": "Bastos"})
+
+        # then: the next read fetches it again
+        user.get_me()
+        assert len(responses.calls) == 3
+
+    @pytest.mark.parametrize("params", [{"status": [1, 2]}, {"filter": {"status": 1}}])
+    def test_unhashable_params_are_sent_uncached(self, sales, responses, params):
+        # when: a read is made twice with params that cannot be a cache key
+        sales.last_days_amount(params)
+        result = sales.last_days_amount(params=params)
+
+        # then: both requests are made as usual
+        assert result == {"amount": 1}
+        assert len(responses.calls) == 2
+
+    @freeze_time(NOW)
+    def test_cache_is_bounded(self, sales):
+        # given: reads with many distinct params
+        for i in range(200):
+            sales.last_days_amount({"page": i})
+
+        # then: the cache never grows past its size
+        assert len(sales._ttl_cache) == 128
+
+        # when: the entries expire and a new read is cached
+        with freeze_time(NOW + timedelta(seconds=6)):
+            sales.last_days_amount({"page": 0})
+
+        # then: the expired entries are evicted
+        assert len(sales._ttl_cache) == 1
+
+    def test_cache_does_not_keep_the_subclient_alive(self, responses):
+        responses.add("GET", "https://api2.eduzz.com/sale/last_days_amount", json={"amount": 1})
+        sales = EduzzSalesSubClient(EduzzSession())
+        sales.last_days_amount()
+        ref = weakref.ref(sales)
+
+        # when: the last reference to the subclient goes away
+        del sales
+        gc.collect()
+
+        # then: it is collected along with its cache
+        assert ref() is None
+
+
+class TestRetrieveMany:
+    @pytest.fixture
+    def sales(self, responses):
+        for sale_id in (1, 2, 3):
+            responses.add("GET", f"https://api2.eduzz.com/sale/get_sale/{sale_id}", json={"id": sale_id})
+        return EduzzSalesSubClient(EduzzSession())
+
+    def test_results_keep_the_given_order(self, sales):
+        # when: many sales are retrieved concurrently
+        result = sales.retrieve_many([3, 1, 2])
+
+        # then: they come back in the order asked
+        assert result == [{"id": 3}, {"id": 1}, {"id": 2}]
+
+    def test_no_ids_retrieve_nothing(self, sales, responses):
+        # when: no sales are asked for
+        result = sales.retrieve_many([])
+
+        # then: no request is made
+        assert result == []
+        assert len(responses.calls) == 0
+
+    def test_a_failed_lookup_reaches_the_caller(self, sales, responses):
+        responses.add("GET", "https://api2.eduzz.com/sale/get_sale/404", status=404, body="Not Found")
+
+        # when: one of the sales cannot be retrieved
+        # then: its error is raised instead of a partial result
+        with pytest.raises(HTTPError, match="404"):
+            sales.retrieve_many([1, 404, 2, 3])
+
+
+class TestEduzzAuthLifecycle:
+    def test_renewals_share_a_session_until_close(self, auth, responses, monkeypatch):
+        responses.add(**token_response("T1"))
+        responses.add(**token_response("T2"))
+
+        # given: two renewals
+        auth.renew()
+        session = auth._auth_session
+        auth.renew()
+
+        # then: they went through the same session
+        assert auth._auth_session is session
+
+        # when: the auth is closed
+        closed = []
+        monkeypatch.setattr(session, "close", lambda: closed.append(session))
+        auth.close()
+
+        # then: the session is closed and released
+        assert closed == [session]
+        assert auth._auth_session is None
+
+    def test_renewal_after_close_keeps_no_session(self, auth, responses):
+        responses.add(**token_response("T1"))
+
+        # given: a closed auth
+        auth.close()
+
+        # when: it is renewed anyway
+        token, _ = auth.renew()
+
+        # then: the token is issued without leaving a session open
+        assert token == "T1"
+        assert auth._auth_session is None
+
+    def test_auth_dropped_without_close_is_collected(self, responses):
+        responses.add(**token_response("T1"))
+
+        # given: an auth with a background renewal scheduled
+        auth = EduzzAuth(TokenStore.in_memory(), "email", "publickey", "apikey")
+        auth.token  # noqa: B018
+        timer, ref = auth._refresh_timer, weakref.ref(auth)
+
+        # when: it is dropped without close()
+        del auth
+        gc.collect()
+
+        # then: it is collected and its timer cancelled
+        assert ref() is None
+        assert timer.finished.is_set()
+
+
+def eduzz_response(status_code, content):
+    response = EduzzResponse()
+    response.status_code = status_code
+    response.reason = "Error"
+    response.url = "https://api2.eduzz.com/user/get_me"
+    response._content = content
+    return response
+
+
+class TestEduzzResponse:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"<html><body>Bad Gateway</body></html>",
+            b'{"error": "unexpected"}',
+            b'["code", "details"]',
+        ],
+    )
+    def test_bodies_that_are_not_api_errors_raise_http_error(self, content):
+        # given: an error response whose body is not an API error
+        response = eduzz_response(500, content)
+
+        # when: its status is checked
+        # then: the plain HTTP error is raised
+        with pytest.raises(HTTPError) as exc_info:
+            response.raise_for_status()
+        assert not isinstance(exc_info.value, EduzzAPIError)
+
+    def test_api_errors_raise_eduzz_api_error(self):
+        # given: an error response with the API error body
+        response = eduzz_response(500, b'{"code": "E42", "details": "Something failed"}')
+
+        # when: its status is checked
+        # then: the API error is raised with its code and details
+        with pytest.raises(EduzzAPIError, match="^E42 Something failed$"):
+            response.raise_for_status()
+
+
+class SampleSmallPoolSession(EduzzSession):
+    POOL_SIZE = 4
+
+
+class TestEduzzSession:
+    @pytest.mark.parametrize(("session_class", "pool_size"), [(EduzzSession, 50), (SampleSmallPoolSession, 4)])
+    def test_pool_follows_pool_size(self, session_class, pool_size):
+        # given: a session
+        session = session_class()
+
+        # when: the adapter for the API is picked
+        adapter = session.get_adapter("https://api2.eduzz.com")
+
+        # then: its pool keeps POOL_SIZE connections
+        assert adapter._pool_maxsize == pool_size
+        assert adapter._pool_connections == pool_size
+
+
+class TestEduzzClient:
+    def test_context_manager_closes_the_auth(self):
+        # given: a client used as a context manager
+        auth = EduzzAuth(TokenStore.in_memory(), "email", "publickey", "apikey")
+
+        # when: the block ends
+        with EduzzClient(EduzzSession(auth=auth)):
+            pass
+
+        # then: the auth is closed along with the session
+        assert auth._closed
+
+    def test_close_accepts_other_auths(self):
+        # given: a client authenticated with something other than EduzzAuth
+        client = EduzzClient(EduzzSession(auth=("user", "pass")))
+
+        # when: it is closed
+        # then: only the session is closed, without errors
+        client.close()
@@ -44,6 +44,27 @@ class TestProResponse:
 
         assert response.json() == {"a": 1, "b": 1.23, "test": "from decoder", "custom_kwargs": {"a": 42}}
 
+    def test_json_is_decoded_once(self):
+        # given: a response whose json was already decoded, e.g. by raise_for_status
+        response = ProResponse()
+        response._content = b'{"a": 1}'
+        first = response.json()
+
+        # when: the json is requested again
+        # then: the cached result is returned without decoding the content again
+        assert response.json() is first
+
+    def test_json_with_kwargs_is_not_cached(self):
+        # given: a response whose json was already decoded
+        response = ProResponse()
+        response._content = b'{"a": 1.5}'
+        response.json()
+
+        # when: the json is requested with decoding kwargs
+        # then: the content is decoded again honoring them
+        assert response.json(parse_float=str) == {"a": "1.5"}
+        assert response.json() == {"a": 1.5}
+
 
 class SampleCustomJsonSession(CustomJsonSession, CustomResponseSession):
     JSON_ENCODER = SampleEncoder
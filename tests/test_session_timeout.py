@@ -1,22 +1,60 @@
+from collections import OrderedDict
+from copy import copy
+
 from requests import Response
 from requests.adapters import BaseAdapter
 
 from requestspro.sessions import BaseSession
 
 import pytest
-from unittest.mock import MagicMock
+
+
+CANNED_RESPONSE = Response()
+CANNED_RESPONSE.status_code = 200
+CANNED_RESPONSE.headers["Content-Type"] = "application/json"
+CANNED_RESPONSE._content = b'{"key": "value"}'
+
+
+class SampleTimeoutSession(BaseSession):
+    TIMEOUT = 10.0
+
+
+def set_only_adapter(session, adapter):
+    """Route every request to adapter without Session.mount re-sorting the adapters on each call."""
+    session.adapters = OrderedDict([("https://", adapter), ("http://", adapter)])
+
+
+class RecordingAdapter(BaseAdapter):
+    """Adapter that records the kwargs of each send and answers with the canned response."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(kwargs)
+        return copy(CANNED_RESPONSE)
+
+    def close(self):
+        pass
 
 
 @pytest.fixture
 def mock_adapter():
-    """Create a mock HTTP adapter with a standard response."""
-    mock_adapter = MagicMock(spec=BaseAdapter)
-    mock_response = Response()
-    mock_response.status_code = 200
-    mock_response.headers["Content-Type"] = "application/json"
-    mock_response._content = b'{"key": "value"}'
-    mock_adapter.send.return_value = mock_response
-    return mock_adapter
+    """Create a stub HTTP adapter with a standard response."""
+    return RecordingAdapter()
+
+
+@pytest.fixture(scope="module")
+def base_session_factory():
+    """Build a single BaseSession for the module and rebind its timeout for each test."""
+    session = BaseSession()
+
+    def make(timeout=None):
+        session.timeout = timeout
+        return session
+
+    return make
 
 
 class TestBaseSessionTimeout:
@@ -27,17 +65,11 @@ class TestBaseSessionTimeout:
         assert session.timeout == 5.0
 
     def test_timeout_class_attribute(self):
-        class CustomSession(BaseSession):
-            TIMEOUT = 10.0
-
-        session = CustomSession()
+        session = SampleTimeoutSession()
         assert session.timeout == 10.0
 
     def test_timeout_parameter_overrides_class_attribute(self):
-        class CustomSession(BaseSession):
-            TIMEOUT = 10.0
-
-        session = CustomSession(timeout=5.0)
+        session = SampleTimeoutSession(timeout=5.0)
         assert session.timeout == 5.0
 
     def test_no_timeout_default(self):
@@ -49,50 +81,27 @@ class TestBaseSessionTimeout:
         assert session.timeout is None
 
     @pytest.mark.parametrize(
-        ("timeout_value", "description"),
+        ("session_timeout", "call_kwargs", "expected", "description"),
         [
-            (5.0, "single float timeout"),
-            ((3.0, 10.0), "tuple timeout (connect, read)"),
+            (None, {}, None, "no timeout"),
+            (5.0, {}, 5.0, "single float timeout"),
+            ((3.0, 10.0), {}, (3.0, 10.0), "tuple timeout (connect, read)"),
+            (0, {}, 0, "zero timeout is still a timeout"),
+            (5.0, {"timeout": 10.0}, 10.0, "per-request timeout overrides session timeout"),
+            (5.0, {"timeout": None}, None, "per-request None disables session timeout"),
         ],
     )
-    def test_session_timeout_applied_to_request(self, mock_adapter, timeout_value, description):
-        """Session timeout is used when no per-request timeout provided."""
-        session = BaseSession(timeout=timeout_value)
-        session.mount("http://", mock_adapter)
+    def test_timeout_resolution(
+        self, base_session_factory, mock_adapter, session_timeout, call_kwargs, expected, description
+    ):
+        """Per-request timeout takes precedence; otherwise the session timeout, or its absence, is used."""
+        session = base_session_factory(timeout=session_timeout)
+        set_only_adapter(session, mock_adapter)
 
         # Make request
-        response = session.request("GET", "http://example.com")
-
-        # Verify timeout was passed to send method
-        mock_adapter.send.assert_called_once()
-        args, kwargs = mock_adapter.send.call_args
-        assert kwargs["timeout"] == timeout_value
-        assert response.status_code == 200
-
-    def test_per_request_timeout_overrides_session_timeout(self, mock_adapter):
-        """Per-request timeout takes precedence over session timeout."""
-        session = BaseSession(timeout=5.0)
-        session.mount("http://", mock_adapter)
-
-        # Make request with per-request timeout
-        response = session.request("GET", "http://example.com", timeout=10.0)
-
-        # Verify per-request timeout was used
-        mock_adapter.send.assert_called_once()
-        args, kwargs = mock_adapter.send.call_args
-        assert kwargs["timeout"] == 10.0
-        assert response.status_code == 200
-
-    def test_no_session_timeout_no_per_request_timeout(self, mock_adapter):
-        """No timeout applied when neither session nor per-request timeout provided."""
-        session = BaseSession()
-        session.mount("http://", mock_adapter)
-
-        # Make request without any timeout
-        response = session.request("GET", "http://example.com")
+        response = session.request("GET", "http://example.com", **call_kwargs)
 
-        # Verify no timeout was passed (should be None by default)
-        mock_adapter.send.assert_called_once()
-        args, kwargs = mock_adapter.send.call_args
-        assert kwargs["timeout"] is None
+        # Verify the resolved timeout was passed to send method
+        [kwargs] = mock_adapter.sent
+        assert kwargs["timeout"] == expected
         assert response.status_code == 200